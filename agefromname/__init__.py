@@ -1,3 +1,4 @@
+from agefromname.name_dataset import NameDataset
 from agefromname.age_from_name import AgeFromName
 from agefromname.generation_from_name import GenerationFromName, InvalidGenerationBirthYearDefinition
 
@@ -1,76 +1,174 @@
-import os
+import threading
+from concurrent.futures import Future
 from datetime import datetime
 
 import numpy as np
 import pandas as pd
 from statsmodels.stats.proportion import proportion_confint
 
+from agefromname.name_dataset import NameDataset, _get_data_path, _read_data_file
+
 
 class InvalidSexException(Exception):
     pass
 
 
 class AgeFromName(object):
-    def __init__(self, mortality_df=None, year_of_birth_df=None):
+    def __init__(self, mortality_df=None, year_of_birth_df=None, dataset=None):
         '''
         :param mortality_df: pd.DataFrame, optional
         :param year_of_birth_df: pd.DataFrame, optional
+        :param dataset: NameDataset, optional. Takes precedence over mortality_df and
+            year_of_birth_df.
         '''
-        if mortality_df is None:
-            self._mortality_df = pd.read_csv(self._get_data_path('mortality_table.csv.gz'))
-        else:
-            self._mortality_df = mortality_df
-        if year_of_birth_df is None:
-            self._year_of_birth_df = pd.read_csv(self._get_data_path('year_of_birth_counts.csv.gz'))
-        else:
-            self._year_of_birth_df = year_of_birth_df
+        if dataset is None:
+            if mortality_df is None and year_of_birth_df is None:
+                dataset = NameDataset.from_files()
+            else:
+                if mortality_df is None:
+                    mortality_df = _read_data_file(self._get_data_path('mortality_table.csv.gz'))
+                if year_of_birth_df is None:
+                    year_of_birth_df = _read_data_file(self._get_data_path('year_of_birth_counts.csv.gz'))
+                dataset = NameDataset(mortality_df, year_of_birth_df)
+        self._dataset = dataset
+        self._reload_lock = threading.Lock()
+        self._reload_count = 0
+        self._swapped_reload_number = 0
 
     def _get_data_path(self, file_name):
-        return os.path.join(os.path.dirname(__file__), 'data', file_name)
+        return _get_data_path(file_name)
+
+    @property
+    def dataset(self):
+        '''
+        :return: NameDataset, the snapshot new queries will run against
+        '''
+        return self._dataset
+
+    @property
+    def dataset_version(self):
+        '''
+        :return: str, version of the dataset new queries will run against
+        '''
+        return self._dataset.version
+
+    def reload(self, dataset=None, background=False, prepare=None):
+        '''
+        Swaps in a new dataset. Queries already running keep using the snapshot
+        they started with; queries started after the swap see the new one. If reloads overlap,
+        the one requested last wins, and an earlier one finishing later does not swap.
+
+        :param dataset: NameDataset, optional, defaults to re-reading the packaged data files
+        :param background: bool, optional, if True, load and swap in a daemon thread,
+            defaults to False. If loading fails, the current dataset stays in use.
+        :param prepare: bool, optional, if True, call NameDataset.prepare before swapping so
+            as_numpy queries do not build its arrays. Defaults to preparing only if the
+            current dataset has been prepared.
+        :return: NameDataset in use once the reload finished, or, if background is True, a
+            running concurrent.futures.Future resolving to it or to the loading exception.
+            The future cannot be cancelled.
+        '''
+        if prepare is None:
+            prepare = self._dataset.prepared
+        with self._reload_lock:
+            self._reload_count += 1
+            reload_number = self._reload_count
+        if background:
+            future = Future()
+            # running from the start, so cancel() cannot report a reload that still swaps
+            future.set_running_or_notify_cancel()
+            thread = threading.Thread(target=self._reload_into_future,
+                                      args=(future, dataset, prepare, reload_number))
+            thread.daemon = True
+            thread.start()
+            return future
+        return self._load_and_swap(dataset, prepare, reload_number)
 
-    def prob_male(self, first_name, current_year=datetime.now().year, minimum_age=0, maximum_age=1000):
+    def _reload_into_future(self, future, dataset, prepare, reload_number):
+        try:
+            future.set_result(self._load_and_swap(dataset, prepare, reload_number))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _load_and_swap(self, dataset, prepare, reload_number):
+        if dataset is None:
+            dataset = NameDataset.from_files()
+        if prepare:
+            dataset.prepare()
+        with self._reload_lock:
+            if reload_number > self._swapped_reload_number:
+                self._dataset = dataset
+                self._swapped_reload_number = reload_number
+            return self._dataset
+
+    def prob_male(self, first_name, current_year=datetime.now().year, minimum_age=0, maximum_age=1000,
+                  as_numpy=False):
         '''
         :param first_name: str, First name
         :param current_year: int, optional, defaults to current year
         :param minimum_age: int, optional, defaults to 0
         :param maximum_age: int, optional, defaults to 1000
+        :param as_numpy: bool, optional, compute from the dataset's precomputed arrays
+            instead of pandas, defaults to False
         :return: float, probability person is male
         '''
-        male_count = self.get_estimated_counts(first_name, 'm', current_year,
-                                               minimum_age, maximum_age).sum()
-        female_count = self.get_estimated_counts(first_name, 'f', current_year,
-                                                 minimum_age, maximum_age).sum()
+        dataset = self._dataset
+        if as_numpy:
+            first_name = first_name.lower()
+            male_count = self._get_estimated_count_total(dataset, first_name, 'm', current_year,
+                                                         minimum_age, maximum_age)
+            female_count = self._get_estimated_count_total(dataset, first_name, 'f', current_year,
+                                                           minimum_age, maximum_age)
+            if male_count + female_count == 0: return 0.5
+            return float(male_count / (male_count + female_count))
+        male_count = self._get_estimated_counts(dataset, first_name, 'm', current_year,
+                                                minimum_age, maximum_age).sum()
+        female_count = self._get_estimated_counts(dataset, first_name, 'f', current_year,
+                                                  minimum_age, maximum_age).sum()
         if male_count + female_count == 0: return 0.5
         prob = male_count * 1. / (male_count + female_count)
         return prob
 
     def prob_female(self, first_name, current_year=datetime.now().year,
-                    minimum_age=0, maximum_age=1000):
-        return 1 - self.prob_male(first_name, current_year, minimum_age, maximum_age)
+                    minimum_age=0, maximum_age=1000, as_numpy=False):
+        return 1 - self.prob_male(first_name, current_year, minimum_age, maximum_age, as_numpy)
 
     def get_estimated_counts(self,
                              first_name,
                              sex=None,
                              current_year=datetime.now().year,
                              minimum_age=0,
-                             maximum_age=1000):
+                             maximum_age=1000,
+                             as_numpy=False):
         '''
         :param first_name: str, First name. None by default returns
         :param sex: str, m or f for sex. None to ignore, by default.
         :param current_year: int, optional, defaults to current year
         :param minimum_age: int, optional, defaults to 0
         :param maximum_age: int, optional, defaults to 1000
+        :param as_numpy: bool, optional, return arrays instead of a pd.Series, defaults to False
         :return: pd.Series, with int indices indicating years of
-            birth, and estimated counts of total population with that name and birth year
+            birth, and estimated counts of total population with that name and birth year.
+            If as_numpy, a tuple of np.ndarrays, the ascending years of birth (may be read-only and
+            shared with the dataset) and the estimated counts.
         '''
+        if as_numpy:
+            return self._get_estimated_count_arrays(self._dataset, first_name, sex, current_year,
+                                                    minimum_age, maximum_age)
+        return self._get_estimated_counts(self._dataset, first_name, sex, current_year,
+                                          minimum_age, maximum_age)
+
+    def _get_estimated_counts(self, dataset, first_name, sex, current_year, minimum_age, maximum_age):
         first_name = first_name.lower()
         sex = self._check_and_normalize_gender(sex)
 
         if sex is not None:
-            cur_df = (self._year_of_birth_df[self._birth_year_df_mask(current_year, first_name,
-                                                                      minimum_age, maximum_age, sex)]
+            year_of_birth_df = dataset.year_of_birth_df
+            mortality_df = dataset.mortality_df
+            cur_df = (year_of_birth_df[self._birth_year_df_mask(year_of_birth_df, current_year, first_name,
+                                                                minimum_age, maximum_age, sex)]
             [['year_of_birth', 'count']])
-            year_stats = (self._mortality_df[self._mortality_df.as_of_year == current_year]
+            year_stats = (mortality_df[mortality_df.as_of_year == current_year]
             [['year_of_birth', sex + '_prob_alive']])
             cur_df['prob_alive'] = np.interp(cur_df.year_of_birth,
                                              year_stats.year_of_birth,
@@ -78,8 +176,8 @@ class AgeFromName(object):
             cur_df['estimated_count'] = cur_df['prob_alive'] * cur_df['count']
             return cur_df.set_index('year_of_birth')['estimated_count']
         else:
-            m_df = self.get_estimated_counts(first_name, 'm', current_year, minimum_age, maximum_age)
-            f_df = self.get_estimated_counts(first_name, 'f', current_year, minimum_age, maximum_age)
+            m_df = self._get_estimated_counts(dataset, first_name, 'm', current_year, minimum_age, maximum_age)
+            f_df = self._get_estimated_counts(dataset, first_name, 'f', current_year, minimum_age, maximum_age)
             to_ret = pd.merge(pd.DataFrame(m_df),
                               pd.DataFrame(f_df),
                               how='outer',
@@ -89,6 +187,42 @@ class AgeFromName(object):
             to_ret.name = 'estimated_count'
             return to_ret
 
+    def _get_estimated_count_arrays(self, dataset, first_name, sex, current_year, minimum_age, maximum_age):
+        first_name = first_name.lower()
+        sex = self._check_and_normalize_gender(sex)
+
+        if sex is not None:
+            years, counts, year_offsets = self._name_arrays_in_age_range(dataset, first_name, sex, current_year,
+                                                                         minimum_age, maximum_age)
+            return years, dataset.prob_alive_by_year(current_year, sex).take(year_offsets) * counts
+        else:
+            m_years, m_counts = self._get_estimated_count_arrays(dataset, first_name, 'm', current_year,
+                                                                 minimum_age, maximum_age)
+            f_years, f_counts = self._get_estimated_count_arrays(dataset, first_name, 'f', current_year,
+                                                                 minimum_age, maximum_age)
+            years = np.union1d(m_years, f_years)
+            counts = np.zeros(len(years))
+            counts[years.searchsorted(m_years)] += m_counts
+            counts[years.searchsorted(f_years)] += f_counts
+            return years, counts
+
+    def _get_estimated_count_total(self, dataset, first_name, sex, current_year, minimum_age, maximum_age):
+        years, counts, year_offsets = self._name_arrays_in_age_range(dataset, first_name, sex, current_year,
+                                                                     minimum_age, maximum_age)
+        return dataset.prob_alive_by_year(current_year, sex).take(year_offsets).dot(counts)
+
+    def _name_arrays_in_age_range(self, dataset, first_name, sex, current_year, minimum_age, maximum_age):
+        years, counts, year_offsets = name_arrays = dataset.name_arrays(first_name, sex)
+        if len(years) == 0:
+            return name_arrays
+        first_year = current_year - maximum_age
+        last_year = current_year - minimum_age
+        if years[0] >= first_year and years[-1] <= last_year:
+            return name_arrays
+        start = years.searchsorted(first_year, 'left')
+        end = years.searchsorted(last_year, 'right')
+        return years[start:end], counts[start:end], year_offsets[start:end]
+
     def get_all_name_male_prob(self,
                                current_year=datetime.now().year,
                                minimum_age=0,
@@ -133,7 +267,7 @@ class AgeFromName(object):
 
     def _get_gender_stats_df(self, current_year, minimum_age, maximum_age,
                              nonnumerator_gender, numerator_gender, alpha, method):
-        mf_df = self._make_all_names_joint_df(current_year, minimum_age, maximum_age)
+        mf_df = self._make_all_names_joint_df(self._dataset, current_year, minimum_age, maximum_age)
         return pd.DataFrame(mf_df.reset_index().groupby('first_name').sum()
                             [[numerator_gender,
                               nonnumerator_gender]]
@@ -148,8 +282,9 @@ class AgeFromName(object):
         prob = f_num / (f_num + m_num)
         return pd.Series({'lo': lo, 'hi': hi, 'prob': prob})
 
-    def _make_all_names_joint_df(self, current_year, minimum_age, maximum_age):
-        f_df, m_df = [self._get_estimated_counts_all_names(sex=sex,
+    def _make_all_names_joint_df(self, dataset, current_year, minimum_age, maximum_age):
+        f_df, m_df = [self._get_estimated_counts_all_names(dataset=dataset,
+                                                           sex=sex,
                                                            minimum_age=minimum_age,
                                                            maximum_age=maximum_age,
                                                            current_year=current_year)
@@ -163,11 +298,13 @@ class AgeFromName(object):
         return mf_df
 
     def _get_estimated_counts_all_names(self,
+                                        dataset,
                                         sex,
                                         current_year=datetime.now().year,
                                         minimum_age=0,
                                         maximum_age=1000):
         '''
+        :param dataset: NameDataset
         :param sex: str, m or f for sex.
         :param current_year: int, optional, defaults to current year
         :param minimum_age: int, optional, defaults to 0
@@ -176,14 +313,17 @@ class AgeFromName(object):
             birth, and estimated counts of total population with that name and birth year
         '''
         sex = self._check_and_normalize_gender(sex)
-        cur_df = (self._year_of_birth_df[
-            self._birth_year_df_mask(current_year=current_year,
+        year_of_birth_df = dataset.year_of_birth_df
+        mortality_df = dataset.mortality_df
+        cur_df = (year_of_birth_df[
+            self._birth_year_df_mask(year_of_birth_df=year_of_birth_df,
+                                     current_year=current_year,
                                      first_name=None,
                                      minimum_age=minimum_age,
                                      maximum_age=maximum_age,
                                      sex=sex)
         ][['first_name', 'year_of_birth', 'count']])
-        year_stats = (self._mortality_df[self._mortality_df.as_of_year == current_year]
+        year_stats = (mortality_df[mortality_df.as_of_year == current_year]
         [['year_of_birth', sex + '_prob_alive']])
         cur_df['prob_alive'] = np.interp(cur_df.year_of_birth,
                                          year_stats.year_of_birth,
@@ -201,23 +341,30 @@ class AgeFromName(object):
             raise InvalidSexException('The parameter sex must be "m" or "f" and not "%s".' % gender)
         return gender.lower()
 
-    def _birth_year_df_mask(self, current_year, first_name, minimum_age, maximum_age, sex):
-        mask = ((self._year_of_birth_df.year_of_birth <= (current_year - minimum_age))
-                & (self._year_of_birth_df.year_of_birth >= (current_year - maximum_age)))
+    def _birth_year_df_mask(self, year_of_birth_df, current_year, first_name, minimum_age, maximum_age, sex):
+        mask = ((year_of_birth_df.year_of_birth <= (current_year - minimum_age))
+                & (year_of_birth_df.year_of_birth >= (current_year - maximum_age)))
         if sex is not None:
-            mask &= (self._year_of_birth_df.sex == sex)
+            mask &= (year_of_birth_df.sex == sex)
         if first_name is not None:
-            mask &= (self._year_of_birth_df.first_name == first_name)
+            mask &= (year_of_birth_df.first_name == first_name)
         return mask
 
-    def argmax(self, first_name, sex, current_year=datetime.now().year, minimum_age=0, maximum_age=1000):
+    def argmax(self, first_name, sex, current_year=datetime.now().year, minimum_age=0, maximum_age=1000,
+               as_numpy=False):
         '''
         :param first_name: str, First name
         :param sex: str, m or f for sex
         :param current_year: int, optional, defaults to current year
         :param minimum_age: int, optional, defaults to 0
+        :param as_numpy: bool, optional, compute from the dataset's precomputed arrays
+            instead of pandas, defaults to False
         :return: int, the most likely year of birth
         '''
+        if as_numpy:
+            years, counts = self._get_estimated_count_arrays(self._dataset, first_name, sex, current_year,
+                                                             minimum_age, maximum_age)
+            return int(years[counts.argmax()])
         return self.get_estimated_counts(first_name, sex, current_year, minimum_age, maximum_age).idxmax()
 
     def get_estimated_distribution(self,
@@ -225,17 +372,25 @@ class AgeFromName(object):
                                    sex,
                                    current_year=datetime.now().year,
                                    minimum_age=0,
-                                   maximum_age=1000):
+                                   maximum_age=1000,
+                                   as_numpy=False):
         '''
         :param first_name: str, First name
         :param sex: str, m or f for sex
         :param current_year: int, optional, defaults to current year
         :param minimum_age: int, optional, defaults to 0
         :param maximum_age: int, optional, defaults to 1000
+        :param as_numpy: bool, optional, return arrays instead of a pd.Series, defaults to False
         :return: pd.Series, with int indices indicating years of
             birth, and the estimated percentage of the total population of people who share sex and
             first name who were born that year.
+            If as_numpy, a tuple of np.ndarrays, the ascending years of birth (may be read-only and
+            shared with the dataset) and the percentages.
         '''
+        if as_numpy:
+            years, counts = self._get_estimated_count_arrays(self._dataset, first_name, sex, current_year,
+                                                             minimum_age, maximum_age)
+            return years, counts / counts.sum()
         age_counts = self.get_estimated_counts(first_name, sex, current_year, minimum_age, maximum_age)
         to_ret = age_counts / age_counts.sum()
         to_ret.name = 'estimate_percentage'
@@ -1,5 +1,6 @@
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 from agefromname import AgeFromName
@@ -27,8 +28,30 @@ class GenerationFromName(object):
 		'''
 		self._validate_generation_birth_years(generation_birth_years)
 		self._generation_birth_years = generation_birth_years
+		self._generation_names = np.array(list(generation_birth_years.keys()) + ['_other'])
+		self._generation_first_years = np.array([genmin for genmin, _ in generation_birth_years.values()])
+		self._generation_last_years = np.array([genmax for _, genmax in generation_birth_years.values()])
 		self._age_from_name = age_from_name if age_from_name is not None else AgeFromName()
 
+	@property
+	def dataset_version(self):
+		'''
+		:return: str, version of the dataset used by the wrapped AgeFromName
+		'''
+		return self._age_from_name.dataset_version
+
+	def reload(self, dataset=None, background=False, prepare=None):
+		'''
+		Swaps a new dataset into the wrapped AgeFromName. See AgeFromName.reload.
+
+		:param dataset: NameDataset, optional, defaults to re-reading the packaged data files
+		:param background: bool, optional, if True, load and swap in a daemon thread
+		:param prepare: bool, optional, if True, prepare the dataset for as_numpy queries first
+		:return: NameDataset in use once the reload finished, or, if background is True, a
+			concurrent.futures.Future resolving to it or to the loading exception
+		'''
+		return self._age_from_name.reload(dataset, background, prepare)
+
 	def _validate_generation_birth_years(self, generation_birth_years):
 		invalid_type_or_tempate_error = "generation_birth_years must be a dict, which maps generation names to first and last birth years.  Ex: {'Millenials': [1980, 1995],'Generation X': [1956, 1979]}."
 		if type(generation_birth_years) != dict:
@@ -51,16 +74,22 @@ class GenerationFromName(object):
 						ordered_ranges[i - 1], ordered_ranges[i]))
 
 	def get_estimated_counts(self, first_name, sex, current_year=datetime.now().year,
-	                         minimum_age=0, maximum_age=1000):
+	                         minimum_age=0, maximum_age=1000, as_numpy=False):
 		'''
 		:param first_name: str, First name
 		:param sex: str, m or f for sex
 		:param current_year: int, optional, defaults to current year
 		:param minimum_age: int, optional, defaults to 0
 		:param maximum_age: int, optional, defaults to 1000
+		:param as_numpy: bool, optional, return arrays instead of a pd.Series, defaults to False
 		:return: pd.Series, with int indices indicating years of
-			birth, and estimated counts of total population with that name and generation
+			birth, and estimated counts of total population with that name and generation.
+			If as_numpy, a tuple of np.ndarrays, the generation names and the estimated counts.
 		'''
+		if as_numpy:
+			return self._generational_rollup_arrays(
+				*self._age_from_name.get_estimated_counts(first_name, sex, current_year,
+				                                          minimum_age, maximum_age, as_numpy=True))
 		year_counts = self._age_from_name.get_estimated_counts(first_name,
 		                                                       sex,
 		                                                       current_year,
@@ -72,32 +101,44 @@ class GenerationFromName(object):
 
 	def get_estimated_distribution(self, first_name, sex,
 	                               current_year=datetime.now().year,
-	                               minimum_age=0, maximum_age=1000):
+	                               minimum_age=0, maximum_age=1000, as_numpy=False):
 		'''
 		:param first_name: str, First name
 		:param sex: str, m or f for sex
 		:param current_year: int, optional, defaults to current year
 		:param minimum_age: int, optional, defaults to 0
 		:param maximum_age: int, optional, defaults to 1000
+		:param as_numpy: bool, optional, return arrays instead of a pd.Series, defaults to False
 		:return: pd.Series, nd the estimated percentage of the total population of
 		people who share sex andfirst name who were born that generation.
+		If as_numpy, a tuple of np.ndarrays, the generation names and the percentages.
 		'''
+		if as_numpy:
+			return self._generational_rollup_arrays(
+				*self._age_from_name.get_estimated_distribution(first_name, sex, current_year,
+				                                                minimum_age, maximum_age, as_numpy=True))
 		to_ret = self._generational_rollup(self._age_from_name.get_estimated_distribution
 		                                   (first_name, sex, current_year, minimum_age, maximum_age))
 		to_ret.name = 'estimate_percentage'
 		return to_ret
 
 	def argmax(self, first_name, sex, current_year=datetime.now().year,
-	           minimum_age=0, maximum_age=1000):
+	           minimum_age=0, maximum_age=1000, as_numpy=False):
 		'''
 		:param first_name: str, First name
 		:param sex: str, m or f for sex
 		:param current_year: int, optional, defaults to current year
 		:param minimum_age: int, optional, defaults to 0
 		:param maximum_age: int, optional, defaults to 1000
+		:param as_numpy: bool, optional, compute from the dataset's precomputed arrays
+			instead of pandas, defaults to False
 		:return: pd.Series, nd the estimated percentage of the total population of
 		people who share sex andfirst name who were born that generation.
 		'''
+		if as_numpy:
+			generations, counts = self.get_estimated_counts(first_name, sex, current_year,
+			                                                minimum_age, maximum_age, as_numpy=True)
+			return str(generations[counts.argmax()])
 		return self.get_estimated_distribution(first_name, sex,
 		                                       current_year, minimum_age, maximum_age).idxmax()
 
@@ -109,3 +150,10 @@ class GenerationFromName(object):
 		generation_counts['_other'] = year_counts.sum() - sum(generation_counts.values())
 		to_ret = pd.Series(generation_counts)
 		return to_ret
+
+	def _generational_rollup_arrays(self, years, year_counts):
+		cumulative_counts = np.concatenate([[0.], year_counts.cumsum()])
+		generation_counts = (cumulative_counts[years.searchsorted(self._generation_last_years, 'right')]
+		                     - cumulative_counts[years.searchsorted(self._generation_first_years, 'left')])
+		return (self._generation_names.copy(),
+		        np.append(generation_counts, cumulative_counts[-1] - generation_counts.sum()))
@@ -0,0 +1,194 @@
+import hashlib
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+def _read_only(array):
+    array.flags.writeable = False
+    return array
+
+
+_EMPTY_ARRAYS = (_read_only(np.array([], dtype=np.int64)),
+                 _read_only(np.array([], dtype=np.float64)),
+                 _read_only(np.array([], dtype=np.intp)))
+
+
+def _get_data_path(file_name):
+    return os.path.join(os.path.dirname(__file__), 'data', file_name)
+
+
+def _read_data_file(path):
+    # round_trip parsing reads back exactly the floats to_csv wrote, so a checksum of the
+    # frames matches the one taken before they were saved
+    return pd.read_csv(path, float_precision='round_trip')
+
+
+class NameDataset(object):
+    '''
+    An immutable, versioned snapshot of the year of birth counts and mortality table
+    used by AgeFromName. A new SSA release is loaded into a new NameDataset and swapped in
+    with AgeFromName.reload, leaving in-flight queries on the snapshot they started with.
+    '''
+
+    def __init__(self, mortality_df, year_of_birth_df, version=None):
+        '''
+        :param mortality_df: pd.DataFrame, with the columns year_of_birth, as_of_year,
+            m_prob_alive and f_prob_alive
+        :param year_of_birth_df: pd.DataFrame, with the columns first_name, sex, count and
+            year_of_birth
+        :param version: str, optional, defaults to "<first year>-<last year>-<checksum prefix>"
+        '''
+        self._mortality_df = mortality_df
+        self._year_of_birth_df = year_of_birth_df
+        self._first_year_of_birth = int(year_of_birth_df.year_of_birth.min())
+        self._last_year_of_birth = int(year_of_birth_df.year_of_birth.max())
+        self._checksum = self._checksum_data_frames(mortality_df, year_of_birth_df)
+        if version is None:
+            version = '%s-%s-%s' % (self._first_year_of_birth,
+                                    self._last_year_of_birth,
+                                    self._checksum[:12])
+        self._version = version
+        self._name_arrays = None
+        self._name_arrays_lock = threading.Lock()
+        self._prob_alive_by_year = {}
+
+    @classmethod
+    def from_files(cls,
+                   year_of_birth_path=None,
+                   mortality_path=None,
+                   version=None):
+        '''
+        :param year_of_birth_path: str, optional, path of year of birth counts .csv.gz,
+            defaults to the packaged data/year_of_birth_counts.csv.gz
+        :param mortality_path: str, optional, path of mortality table .csv.gz,
+            defaults to the packaged data/mortality_table.csv.gz
+        :param version: str, optional, see NameDataset.__init__
+        :return: NameDataset
+        '''
+        if year_of_birth_path is None:
+            year_of_birth_path = _get_data_path('year_of_birth_counts.csv.gz')
+        if mortality_path is None:
+            mortality_path = _get_data_path('mortality_table.csv.gz')
+        return cls(_read_data_file(mortality_path),
+                   _read_data_file(year_of_birth_path),
+                   version=version)
+
+    def _checksum_data_frames(self, mortality_df, year_of_birth_df):
+        hasher = hashlib.sha256()
+        for df in (mortality_df, year_of_birth_df):
+            df = df[sorted(df.columns)]
+            hasher.update(','.join(df.columns).encode('utf-8'))
+            hasher.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        return hasher.hexdigest()
+
+    @property
+    def mortality_df(self):
+        return self._mortality_df
+
+    @property
+    def year_of_birth_df(self):
+        return self._year_of_birth_df
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def checksum(self):
+        '''
+        :return: str, sha256 hex digest of the rows and columns of both data frames. It
+            does not depend on whether they were read with from_files or passed in directly.
+        '''
+        return self._checksum
+
+    @property
+    def year_of_birth_range(self):
+        '''
+        :return: tuple, first and last years of birth present in the source data
+        '''
+        return (self._first_year_of_birth, self._last_year_of_birth)
+
+    def prepare(self, current_year=None):
+        '''
+        Builds the per name arrays and the prob alive tables for current_year, so the
+        first as_numpy query does not pay for them. AgeFromName.reload calls this before
+        swapping the dataset in if asked to, or if the dataset it replaces was prepared.
+
+        :param current_year: int, optional, defaults to the current year. Skipped if the
+            mortality table has no rows for it.
+        :return: NameDataset, self
+        '''
+        if current_year is None:
+            current_year = datetime.now().year
+        self._get_name_arrays()
+        if (self._mortality_df.as_of_year == current_year).any():
+            for sex in ('m', 'f'):
+                self.prob_alive_by_year(current_year, sex)
+        return self
+
+    @property
+    def prepared(self):
+        '''
+        :return: bool, True once the per name arrays have been built, by prepare or by an
+            as_numpy query
+        '''
+        return self._name_arrays is not None
+
+    def name_arrays(self, first_name, sex):
+        '''
+        The per name arrays are built for every name on the first call, unless prepare
+        was called.
+
+        :param first_name: str, lower case first name
+        :param sex: str, m or f
+        :return: tuple of read-only np.ndarray, years of birth in ascending order, the birth
+            counts for each, and the position of each year in prob_alive_by_year. All are empty
+            if the name is unknown.
+        '''
+        return self._get_name_arrays().get((first_name, sex), _EMPTY_ARRAYS)
+
+    def _get_name_arrays(self):
+        name_arrays = self._name_arrays
+        if name_arrays is None:
+            with self._name_arrays_lock:
+                if self._name_arrays is None:
+                    self._name_arrays = self._build_name_arrays()
+                name_arrays = self._name_arrays
+        return name_arrays
+
+    def _build_name_arrays(self):
+        year_of_birth_df = self._year_of_birth_df.sort_values('year_of_birth', kind='mergesort')
+        years = year_of_birth_df.year_of_birth.values.astype(np.int64)
+        counts = year_of_birth_df['count'].values.astype(np.float64)
+        year_offsets = (years - self._first_year_of_birth).astype(np.intp)
+        return {key: (_read_only(years[indices]), _read_only(counts[indices]), _read_only(year_offsets[indices]))
+                for key, indices
+                in year_of_birth_df.groupby(['first_name', 'sex']).indices.items()}
+
+    def prob_alive_by_year(self, current_year, sex):
+        '''
+        :param current_year: int
+        :param sex: str, m or f
+        :return: read-only np.ndarray, the probability someone of the given sex is alive in current_year,
+            for each year of birth from the first to the last in year_of_birth_range
+
+        Tables are cached per current_year and sex. The cache only grows with the distinct
+        years queried, and is bounded by the as_of_year values in the mortality table, since
+        other years raise a ValueError.
+        '''
+        key = (current_year, sex)
+        prob_alive = self._prob_alive_by_year.get(key)
+        if prob_alive is None:
+            year_stats = self._mortality_df[self._mortality_df.as_of_year == current_year]
+            prob_alive = np.interp(np.arange(self._first_year_of_birth, self._last_year_of_birth + 1),
+                                   year_stats.year_of_birth,
+                                   year_stats[sex + '_prob_alive'])
+            self._prob_alive_by_year[key] = _read_only(prob_alive)
+        return prob_alive
+
+    def __repr__(self):
+        return 'NameDataset(version=%r)' % self._version
@@ -0,0 +1,15 @@
+import pandas as pd
+
+from agefromname.name_dataset import NameDataset, _get_data_path, _read_data_file
+
+
+def make_dataset(last_year, version=None):
+	mortality_df = _read_data_file(_get_data_path('mortality_table.csv.gz'))
+	year_of_birth_df = pd.DataFrame([{'first_name': 'nancy', 'sex': 'f',
+	                                  'count': 100 + year, 'year_of_birth': year}
+	                                 for year in range(1950, last_year + 1)]
+	                                + [{'first_name': 'nancy', 'sex': 'm',
+	                                    'count': 1, 'year_of_birth': year}
+	                                   for year in range(1950, last_year + 1)])
+	return NameDataset(mortality_df, year_of_birth_df, version=version)
+
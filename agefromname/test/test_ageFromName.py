@@ -1,8 +1,10 @@
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 
 from agefromname.age_from_name import AgeFromName, InvalidSexException
+from agefromname.test import make_dataset
 
 
 class TestBirthYearPredictor(TestCase):
@@ -128,3 +130,37 @@ class TestBirthYearPredictor(TestCase):
 		                                                current_year=1960)
 
 		self.assertLess(argmax_age_30, argmax_age_0)
+
+
+class TestBirthYearPredictorAsNumpy(TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.birth_year_predictor = AgeFromName(dataset=make_dataset(2000))
+
+	def test_get_estimated_counts(self):
+		a = self.birth_year_predictor
+		for sex in ['m', 'F', None]:
+			for kwargs in [{}, {'minimum_age': 30}, {'maximum_age': 40, 'current_year': 2000}]:
+				expected = a.get_estimated_counts('Nancy', sex, **kwargs)
+				years, counts = a.get_estimated_counts('Nancy', sex, as_numpy=True, **kwargs)
+				self.assertEqual(list(years), list(expected.index))
+				np.testing.assert_allclose(counts, expected.values)
+		self.assertEqual(len(a.get_estimated_counts('unknown', 'f', as_numpy=True)[0]), 0)
+
+	def test_get_estimated_distribution(self):
+		a = self.birth_year_predictor
+		expected = a.get_estimated_distribution('nancy', 'f', 1990)
+		years, probs = a.get_estimated_distribution('nancy', 'f', 1990, as_numpy=True)
+		self.assertEqual(list(years), list(expected.index))
+		np.testing.assert_allclose(probs, expected.values)
+
+	def test_argmax(self):
+		a = self.birth_year_predictor
+		self.assertEqual(a.argmax('nancy', 'f', 2010, maximum_age=30, as_numpy=True),
+		                 a.argmax('nancy', 'f', 2010, maximum_age=30))
+
+	def test_prob_male(self):
+		a = self.birth_year_predictor
+		self.assertAlmostEqual(a.prob_male('nancy', 1990, as_numpy=True), a.prob_male('nancy', 1990))
+		self.assertAlmostEqual(a.prob_female('nancy', 1990, as_numpy=True), a.prob_female('nancy', 1990))
+		self.assertEqual(a.prob_male('unknown', as_numpy=True), 0.5)
@@ -1,10 +1,12 @@
 from collections import Counter
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 
 from agefromname import AgeFromName
 from agefromname.generation_from_name import GenerationFromName, InvalidGenerationBirthYearDefinition
+from agefromname.test import make_dataset
 
 
 class TestGenerationFromName(TestCase):
@@ -94,3 +96,26 @@ class TestGenerationFromName(TestCase):
 	def test_argmax_minimum_year(self):
 		g = GenerationFromName({'AAA': [1930, 1945], 'BBB': [1946, 1999]}, self.a)
 		self.assertEqual(g.argmax('nancy', 'f', 1960, minimum_age=20), 'AAA')
+
+
+class TestGenerationFromNameAsNumpy(TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.g = GenerationFromName(age_from_name=AgeFromName(dataset=make_dataset(2000)))
+
+	def test_get_estimated_counts_and_distribution(self):
+		for method in [self.g.get_estimated_counts, self.g.get_estimated_distribution]:
+			expected = method('nancy', 'f', 2010, minimum_age=15)
+			generations, values = method('nancy', 'f', 2010, minimum_age=15, as_numpy=True)
+			self.assertEqual(list(generations), list(expected.index))
+			np.testing.assert_allclose(values, expected.values, atol=1e-9)
+
+	def test_argmax(self):
+		self.assertEqual(self.g.argmax('nancy', 'f', 2010, as_numpy=True), self.g.argmax('nancy', 'f', 2010))
+
+	def test_unknown_name_without_sex(self):
+		generations, counts = self.g.get_estimated_counts('unknown', None, 2010, as_numpy=True)
+		self.assertEqual(list(generations), list(self.g.get_estimated_counts('unknown', None, 2010).index))
+		self.assertEqual(list(counts), [0] * len(generations))
+		self.assertEqual(self.g.argmax('unknown', None, 2010, as_numpy=True), 'Greatest')
+		self.assertEqual(self.g.argmax('unknown', None, 2010), 'Greatest')
@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import patch
+
+from agefromname import AgeFromName, GenerationFromName, NameDataset
+from agefromname.test import make_dataset
+
+
+class TestNameDataset(TestCase):
+	def test_version(self):
+		dataset = make_dataset(1990)
+		self.assertEqual(dataset.year_of_birth_range, (1950, 1990))
+		self.assertEqual(len(dataset.checksum), 64)
+		self.assertEqual(dataset.version, '1950-1990-' + dataset.checksum[:12])
+		self.assertEqual(make_dataset(1990).checksum, dataset.checksum)
+		self.assertNotEqual(make_dataset(1991).checksum, dataset.checksum)
+		self.assertEqual(make_dataset(1990, 'ssa-2017').version, 'ssa-2017')
+
+	def test_checksum_independent_of_load_path(self):
+		dataset = make_dataset(1990)
+		temp_dir = tempfile.mkdtemp()
+		try:
+			year_of_birth_path = os.path.join(temp_dir, 'year_of_birth_counts.csv.gz')
+			mortality_path = os.path.join(temp_dir, 'mortality_table.csv.gz')
+			dataset.year_of_birth_df.to_csv(year_of_birth_path, index=False, compression='gzip')
+			dataset.mortality_df.to_csv(mortality_path, index=False, compression='gzip')
+			self.assertEqual(NameDataset.from_files(year_of_birth_path, mortality_path).version,
+			                 dataset.version)
+		finally:
+			shutil.rmtree(temp_dir)
+
+	def test_cached_arrays_read_only(self):
+		dataset = make_dataset(1990)
+		age_from_name = AgeFromName(dataset=dataset)
+		arrays = (list(dataset.name_arrays('nancy', 'f'))
+		          + list(dataset.name_arrays('unknown', 'f'))
+		          + [dataset.prob_alive_by_year(2010, 'f'),
+		             age_from_name.get_estimated_counts('nancy', 'f', 2010, as_numpy=True)[0],
+		             age_from_name.get_estimated_counts('nancy', 'f', 2010, minimum_age=30, as_numpy=True)[0]])
+		for array in arrays:
+			with self.assertRaises(ValueError):
+				array[:] = 0
+		self.assertEqual(age_from_name.argmax('nancy', 'f', 2010, as_numpy=True), 1990)
+
+	def test_reload(self):
+		old_dataset = make_dataset(1990, 'old')
+		new_dataset = make_dataset(2000, 'new')
+		age_from_name = AgeFromName(dataset=old_dataset)
+		generation_from_name = GenerationFromName(age_from_name=age_from_name)
+		self.assertEqual(generation_from_name.dataset_version, 'old')
+		self.assertEqual(age_from_name.argmax('nancy', 'f', 2010), 1990)
+
+		self.assertIs(age_from_name.reload(new_dataset), new_dataset)
+		self.assertEqual(age_from_name.dataset_version, 'new')
+		self.assertEqual(age_from_name.argmax('nancy', 'f', 2010), 2000)
+
+		self.assertIs(generation_from_name.reload(old_dataset, background=True).result(), old_dataset)
+		self.assertIs(age_from_name.dataset, old_dataset)
+		self.assertEqual(generation_from_name.dataset_version, 'old')
+
+	def test_reload_prepares_dataset(self):
+		age_from_name = AgeFromName(dataset=make_dataset(1990, 'old'))
+		unprepared_dataset = make_dataset(2000, 'unprepared')
+		age_from_name.reload(unprepared_dataset)
+		self.assertFalse(unprepared_dataset.prepared)
+
+		new_dataset = make_dataset(2000, 'new')
+		age_from_name.reload(new_dataset, background=True, prepare=True).result()
+		self.assertTrue(new_dataset.prepared)
+		self.assertEqual(set(new_dataset._prob_alive_by_year),
+		                 {(datetime.now().year, 'm'), (datetime.now().year, 'f')})
+
+		newer_dataset = make_dataset(2000, 'newer')
+		age_from_name.reload(newer_dataset)
+		self.assertTrue(newer_dataset.prepared)
+
+	def test_background_reload_cannot_be_cancelled(self):
+		age_from_name = AgeFromName(dataset=make_dataset(1990, 'old'))
+		new_dataset = make_dataset(2000, 'new')
+		future = age_from_name.reload(new_dataset, background=True)
+		self.assertFalse(future.cancel())
+		self.assertIs(future.result(), new_dataset)
+		self.assertFalse(future.cancelled())
+		self.assertEqual(age_from_name.dataset_version, 'new')
+
+	def test_reload_failure(self):
+		age_from_name = AgeFromName(dataset=make_dataset(1990, 'old'))
+		with patch.object(NameDataset, 'from_files', side_effect=IOError('missing')):
+			future = age_from_name.reload(background=True)
+			with self.assertRaises(IOError):
+				future.result()
+		self.assertEqual(age_from_name.dataset_version, 'old')
+
+	def test_superseded_reload(self):
+		class BlockedNameDataset(NameDataset):
+			def prepare(self, current_year=None):
+				prepare_started.set()
+				finish_prepare.wait(10)
+				return NameDataset.prepare(self, current_year)
+
+		prepare_started = threading.Event()
+		finish_prepare = threading.Event()
+		age_from_name = AgeFromName(dataset=make_dataset(1990, 'old'))
+		dataset = make_dataset(1995)
+		earlier_dataset = BlockedNameDataset(dataset.mortality_df, dataset.year_of_birth_df, 'earlier')
+		earlier = age_from_name.reload(earlier_dataset, background=True, prepare=True)
+		self.assertTrue(prepare_started.wait(10))
+		later = age_from_name.reload(make_dataset(2000, 'later'), background=True)
+		self.assertEqual(later.result().version, 'later')
+		finish_prepare.set()
+		self.assertEqual(earlier.result().version, 'later')
+		self.assertEqual(age_from_name.dataset_version, 'later')
+
+	def test_mixed_data_frames(self):
+		dataset = make_dataset(1990)
+		age_from_name = AgeFromName(dataset.mortality_df, dataset.year_of_birth_df)
+		self.assertEqual(age_from_name.dataset_version, dataset.version)
+		self.assertAlmostEqual(age_from_name.prob_male('nancy', 2010),
+		                       41. / (41 + sum(100 + year for year in range(1950, 1991))),
+		                       places=2)
+